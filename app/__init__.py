@@ -2,18 +2,35 @@
 import os
 from flask import Flask, send_from_directory
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from dotenv import load_dotenv
 from flask_cors import CORS
+from app.compression import init_compression
+from app.json_provider import init_json_provider
+from app.startup import StartupTimer
 
 db = SQLAlchemy()
-migrate = Migrate()
 
-def create_app():
+
+def init_migrate(app):
+    # Flask-Migrate pulls in Alembic (~100 ms of imports) and is only needed for `flask db`
+    from flask_migrate import Migrate
+    Migrate(app, db)
+
+
+def create_app(serving=False):
+    """
+    Build the application.
+    serving=True is for production server processes (see wsgi.py and asgi.py): it skips
+    Flask-Migrate, which only the `flask db` commands use.
+    """
+    timer = StartupTimer()
+
     # Load environment variables from .env
     load_dotenv()
+    timer.mark("load_dotenv")
 
     app = Flask(__name__)
+    app.extensions["startup_timer"] = timer
 
     # ---------------- CONFIG ----------------
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv(
@@ -22,21 +39,32 @@ def create_app():
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "supersecretkey")
 
+    # Responses at least this large are gzip/brotli compressed when the client accepts it
+    app.config["COMPRESS_MIN_SIZE"] = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    app.config["COMPRESS_LEVEL"] = int(os.getenv("COMPRESS_LEVEL", 6))
+    # "orjson" switches to the faster JSON provider when orjson is installed
+    app.config["JSON_PROVIDER"] = os.getenv("JSON_PROVIDER", "default")
+    # Audit events are buffered in memory and written in batches (see app/audit.py)
+    app.config["AUDIT_QUEUE_SIZE"] = int(os.getenv("AUDIT_QUEUE_SIZE", 10000))
+    app.config["AUDIT_BATCH_SIZE"] = int(os.getenv("AUDIT_BATCH_SIZE", 500))
+    # Size of the thread pool the ASGI entry point runs views in (see asgi.py)
+    app.config["ASGI_THREADS"] = int(os.getenv("ASGI_THREADS", 16))
+
     # Limit upload size (optional but recommended)
     app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16 MB
 
     # ---------------- UPLOAD FOLDERS ----------------
-    IMAGE_UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads", "images")
-    DOCS_UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads", "docs")
-    os.makedirs(IMAGE_UPLOAD_FOLDER, exist_ok=True)
-    os.makedirs(DOCS_UPLOAD_FOLDER, exist_ok=True)
-
-    app.config["UPLOAD_FOLDER_IMAGES"] = IMAGE_UPLOAD_FOLDER
-    app.config["UPLOAD_FOLDER_DOCS"] = DOCS_UPLOAD_FOLDER
+    # Created on first upload (see property_routes.upload_path), not on every start
+    app.config["UPLOAD_FOLDER_IMAGES"] = os.path.join(os.getcwd(), "uploads", "images")
+    app.config["UPLOAD_FOLDER_DOCS"] = os.path.join(os.getcwd(), "uploads", "docs")
+    timer.mark("config")
 
     # ---------------- INIT EXTENSIONS ----------------
     db.init_app(app)
-    migrate.init_app(app, db)
+    timer.mark("sqlalchemy")
+    if not serving:
+        init_migrate(app)
+        timer.mark("migrate")
 
     # Enable CORS for frontend dev servers
     CORS(
@@ -47,13 +75,33 @@ def create_app():
         ]}},
         supports_credentials=True
     )
+    timer.mark("cors")
+
+    init_json_provider(app, app.config["JSON_PROVIDER"])
+    init_compression(app)
+    timer.mark("json/compression")
+
+    from app.audit import audit_log
+    audit_log.init_app(app)
 
     # ---------------- ROUTES ----------------
     from app.routes import bp as user_bp
     from app.property_routes import property_bp
+    from app.job_routes import job_bp
+    from app.audit_routes import audit_bp
 
     app.register_blueprint(user_bp)
     app.register_blueprint(property_bp)
+    app.register_blueprint(job_bp)
+    app.register_blueprint(audit_bp)
+    timer.mark("blueprints")
+
+    # ---------------- CLI ----------------
+    from app.jobs import worker_command
+    from app.startup import startup_profile_command
+
+    app.cli.add_command(worker_command)
+    app.cli.add_command(startup_profile_command)
 
     # ---------------- SERVE UPLOADED FILES ----------------
     @app.route("/uploads/images/<filename>")
@@ -64,4 +112,5 @@ def create_app():
     def uploaded_doc(filename):
         return send_from_directory(app.config["UPLOAD_FOLDER_DOCS"], filename)
 
+    timer.mark("routes/cli")
     return app
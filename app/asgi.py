@@ -0,0 +1,185 @@
+# app/asgi.py
+
+import asyncio
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsgiAdapter:
+    """
+    Serves the Flask (WSGI) app over ASGI.
+
+    Request bodies are read on the event loop into a spooled temp file, so a
+    slow client uploading a large file only costs a coroutine. The sync
+    views, and the database work they do, run only once the whole body has
+    arrived. They run in a bounded thread pool of `max_threads` workers.
+    """
+
+    DISK_WRITE_SIZE = 256 * 1024
+
+    def __init__(self, wsgi_app, max_threads=None, spool_max_size=1024 * 1024):
+        self.wsgi_app = wsgi_app
+        self.max_body = wsgi_app.config.get("MAX_CONTENT_LENGTH")
+        self.spool_max_size = spool_max_size
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_threads or wsgi_app.config.get("ASGI_THREADS", 16),
+            thread_name_prefix="asgi-sync",
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self.handle_http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1000})
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self.shutdown)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        audit_log = self.wsgi_app.extensions.get("audit_log")
+        if audit_log is not None:
+            audit_log.shutdown()
+
+    async def handle_http(self, scope, receive, send):
+        headers = scope["headers"]
+        declared = next((v for k, v in headers if k == b"content-length"), None)
+        if self.max_body is not None and declared is not None and declared.isdigit() and int(declared) > self.max_body:
+            await self.send_simple(send, 413, b"Request body too large")
+            return
+
+        body = await self.read_body(receive)
+        if body is None:
+            return  # client disconnected mid-upload
+        if body is False:
+            await self.send_simple(send, 413, b"Request body too large")
+            return
+
+        loop = asyncio.get_running_loop()
+        environ = self.build_environ(scope, body)
+        response = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            response["status"] = int(status.split(" ", 1)[0])
+            response["headers"] = [
+                (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in response_headers
+            ]
+
+        iterable = None
+        try:
+            iterable = await loop.run_in_executor(self.executor, self.wsgi_app, environ, start_response)
+            chunks = iter(iterable)
+            # Chunks are pulled in the pool too: streamed responses may do
+            # blocking work while generating them.
+            first = await loop.run_in_executor(self.executor, next, chunks, None)
+            await send({"type": "http.response.start", "status": response["status"], "headers": response["headers"]})
+            chunk = first
+            while chunk is not None:
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                chunk = await loop.run_in_executor(self.executor, next, chunks, None)
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            if iterable is not None and hasattr(iterable, "close"):
+                await loop.run_in_executor(self.executor, iterable.close)
+            body.close()
+
+    async def read_body(self, receive):
+        """
+        Buffer the request body.
+        Returns the rewound file, None if the client disconnected, or False
+        if the body grew past MAX_CONTENT_LENGTH.
+        """
+        loop = asyncio.get_running_loop()
+        body = tempfile.SpooledTemporaryFile(max_size=self.spool_max_size)
+        pending = bytearray()
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                body.close()
+                return None
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if self.max_body is not None and size > self.max_body:
+                body.close()
+                return False
+            pending += chunk
+            more_body = message.get("more_body", False)
+            # Past spool_max_size the file lives on disk, so writes would block
+            # the event loop; coalesce chunks and write them from a thread.
+            if size > self.spool_max_size:
+                if len(pending) >= self.DISK_WRITE_SIZE or not more_body:
+                    await loop.run_in_executor(None, body.write, bytes(pending))
+                    pending.clear()
+            elif not more_body:
+                body.write(pending)
+                pending.clear()
+            if not more_body:
+                break
+        body.seek(0)
+        return body
+
+    def build_environ(self, scope, body):
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+        body.seek(0, 2)
+        content_length = body.tell()
+        body.seek(0)
+        script_name = scope.get("root_path", "").encode("utf-8").decode("latin-1")
+        path_info = scope["path"].encode("utf-8").decode("latin-1")
+        # Servers may already include root_path in path; don't route on it twice
+        if script_name and path_info.startswith(script_name):
+            path_info = path_info[len(script_name):]
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": script_name,
+            "PATH_INFO": path_info,
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME": str(server[0]),
+            "SERVER_PORT": str(server[1]),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "REMOTE_ADDR": client[0],
+            "REMOTE_PORT": str(client[1]),
+            # The body is fully buffered, so its real length is known even for chunked
+            # uploads (Transfer-Encoding is dropped below so Werkzeug uses this length)
+            "CONTENT_LENGTH": str(content_length),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": body,
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        }
+        for name, value in scope["headers"]:
+            name = name.decode("latin-1")
+            value = value.decode("latin-1")
+            if name in ("content-length", "transfer-encoding"):
+                continue
+            if name == "content-type":
+                environ["CONTENT_TYPE"] = value
+                continue
+            key = "HTTP_" + name.upper().replace("-", "_")
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+    @staticmethod
+    async def send_simple(send, status, body):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"text/plain"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
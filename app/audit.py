@@ -0,0 +1,202 @@
+# app/audit.py
+
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from flask import request
+from sqlalchemy import insert
+from app import db
+from app.models import AuditEvent
+
+
+class AuditLog:
+    """
+    Buffers audit events in memory and writes them in batches from a
+    background thread, so mutating endpoints never pay for an extra commit.
+
+    When the buffer is full, record() waits up to AUDIT_PUT_TIMEOUT seconds
+    and then drops the event. A batch whose insert fails is retried up to
+    AUDIT_WRITE_RETRIES times with backoff before it is given up. Both
+    kinds of loss are counted separately in metrics().
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._atexit_registered = False
+        self._stats = {
+            "recorded": 0,
+            "dropped": 0,
+            "flushed": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "retried_batches": 0,
+            "dropped_after_retry": 0,
+            "max_depth": 0,
+            "last_flush_ms": None,
+        }
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("AUDIT_QUEUE_SIZE", 10000)
+        app.config.setdefault("AUDIT_BATCH_SIZE", 500)
+        app.config.setdefault("AUDIT_FLUSH_INTERVAL", 1.0)
+        app.config.setdefault("AUDIT_PUT_TIMEOUT", 0.01)
+        app.config.setdefault("AUDIT_WRITE_RETRIES", 3)
+        app.config.setdefault("AUDIT_RETRY_DELAY", 0.5)
+        self.app = app
+        self._queue = queue.Queue(maxsize=app.config["AUDIT_QUEUE_SIZE"])
+        app.extensions["audit_log"] = self
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+
+    def _running(self):
+        return self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
+
+    def _count(self, key, n=1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def _ensure_started(self):
+        # Started lazily and per process: a thread started in a preloading
+        # master does not survive the fork into workers.
+        if self._running():
+            return
+        with self._lock:
+            if self._running():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-flusher", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def record(self, action, target_type, target_id=None, details=None, actor_id=None):
+        if actor_id is None:
+            user = getattr(request, "user", None)
+            actor_id = user.id if user is not None else None
+        event = {
+            "actor_id": actor_id,
+            "action": action,
+            "target_type": target_type,
+            "target_id": target_id,
+            "details": details,
+            "created_at": datetime.utcnow(),
+        }
+        self._ensure_started()
+        try:
+            self._queue.put(event, timeout=self.app.config["AUDIT_PUT_TIMEOUT"])
+        except queue.Full:
+            self._count("dropped")
+            self.app.logger.warning("Audit queue full; dropped %s event for %s %s", action, target_type, target_id)
+            return False
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._stats["recorded"] += 1
+            self._stats["max_depth"] = max(self._stats["max_depth"], depth)
+        return True
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _insert(self, batch):
+        with self.app.app_context():
+            try:
+                db.session.execute(insert(AuditEvent), batch)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            finally:
+                db.session.remove()
+
+    def _write(self, batch):
+        started = time.perf_counter()
+        retries = self.app.config["AUDIT_WRITE_RETRIES"]
+        for attempt in range(retries + 1):
+            try:
+                self._insert(batch)
+                break
+            except Exception:
+                self._count("failed_batches")
+                if attempt == retries:
+                    self._count("dropped_after_retry", len(batch))
+                    self.app.logger.exception(
+                        "Dropping %d audit events after %d failed attempts", len(batch), attempt + 1
+                    )
+                    return
+                self._count("retried_batches")
+                self.app.logger.warning("Failed to write %d audit events; retrying", len(batch), exc_info=True)
+                time.sleep(self.app.config["AUDIT_RETRY_DELAY"] * 2 ** attempt)
+        with self._stats_lock:
+            self._stats["flushed"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    def flush(self):
+        """Write everything currently buffered; returns the number of events taken off the queue."""
+        written = 0
+        while True:
+            batch = self._drain(self.app.config["AUDIT_BATCH_SIZE"])
+            if not batch:
+                return written
+            self._write(batch)
+            written += len(batch)
+
+    def _run(self):
+        batch_size = self.app.config["AUDIT_BATCH_SIZE"]
+        interval = self.app.config["AUDIT_FLUSH_INTERVAL"]
+        while not self._stop.is_set():
+            # Flush as soon as a full batch is waiting, otherwise every interval
+            deadline = time.monotonic() + interval
+            while self._queue.qsize() < batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._stop.wait(min(remaining, 0.05))
+            batch = self._drain(batch_size)
+            if batch:
+                self._write(batch)
+
+    def shutdown(self, timeout=5.0):
+        self._stop.set()
+        if self._running():
+            self._thread.join(timeout)
+        if self._queue is not None:
+            self.flush()
+
+    def metrics(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return dict(stats, depth=self._queue.qsize(), capacity=self._queue.maxsize, running=self._running())
+
+
+audit_log = AuditLog()
+
+
+def audit_event_to_dict(e):
+    return {
+        "id": e.id,
+        "actor_id": e.actor_id,
+        "action": e.action,
+        "target_type": e.target_type,
+        "target_id": e.target_id,
+        "details": e.details,
+        "created_at": e.created_at.isoformat() if e.created_at else None,
+    }
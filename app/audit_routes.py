@@ -0,0 +1,63 @@
+# app/audit_routes.py
+
+from datetime import datetime, timezone
+from flask import Blueprint, request, jsonify
+from app.models import AuditEvent
+from app.audit import audit_log, audit_event_to_dict
+from app.utils import role_required
+
+audit_bp = Blueprint("audit", __name__, url_prefix="/audit")
+
+
+def parse_time(value):
+    # created_at is stored as naive UTC, so aware values are converted to match
+    if not value:
+        return None
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def parse_int(value):
+    return int(value) if value else None
+
+
+@audit_bp.route("", methods=["GET"])
+@role_required("admin")
+def list_audit_events():
+    try:
+        since = parse_time(request.args.get("since"))
+        until = parse_time(request.args.get("until"))
+    except ValueError:
+        return jsonify({"error": "since/until must be ISO 8601 timestamps"}), 400
+    try:
+        actor_id = parse_int(request.args.get("actor_id"))
+        target_id = parse_int(request.args.get("target_id"))
+        limit = max(1, min(parse_int(request.args.get("limit")) or 100, 1000))
+    except ValueError:
+        return jsonify({"error": "actor_id, target_id and limit must be integers"}), 400
+
+    # Filters line up with the (actor_id, created_at) and (target_type, target_id, created_at) indexes
+    query = AuditEvent.query
+    if actor_id is not None:
+        query = query.filter(AuditEvent.actor_id == actor_id)
+    if request.args.get("target_type"):
+        query = query.filter(AuditEvent.target_type == request.args["target_type"])
+    if target_id is not None:
+        query = query.filter(AuditEvent.target_id == target_id)
+    if request.args.get("action"):
+        query = query.filter(AuditEvent.action == request.args["action"])
+    if since:
+        query = query.filter(AuditEvent.created_at >= since)
+    if until:
+        query = query.filter(AuditEvent.created_at < until)
+
+    events = query.order_by(AuditEvent.created_at.desc(), AuditEvent.id.desc()).limit(limit).all()
+    return jsonify({"events": [audit_event_to_dict(e) for e in events]})
+
+
+@audit_bp.route("/metrics", methods=["GET"])
+@role_required("admin")
+def audit_metrics():
+    return jsonify(audit_log.metrics())
@@ -0,0 +1,96 @@
+# app/compression.py
+
+import gzip
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "application/javascript",
+}
+
+
+def choose_encoding(accept_encoding):
+    """
+    Pick the best encoding the client accepts, preferring brotli over gzip.
+    Encodings explicitly refused with q=0 are skipped.
+    """
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def compress_stream(chunks, encoding, level):
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=min(level, 11))
+        for chunk in chunks:
+            data = compressor.process(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        # wbits=31 selects the gzip container
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def init_compression(app):
+    app.config.setdefault("COMPRESS_MIN_SIZE", 1024)
+    app.config.setdefault("COMPRESS_LEVEL", 6)
+
+    @app.after_request
+    def compress_response(response):
+        response.vary.add("Accept-Encoding")
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or "Content-Encoding" in response.headers
+            or response.direct_passthrough
+            or request.method == "HEAD"
+        ):
+            return response
+        encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+        level = app.config["COMPRESS_LEVEL"]
+
+        if response.is_streamed:
+            # Compress chunk by chunk so large generated bodies are never held in memory
+            response.response = compress_stream(response.response, encoding, level)
+            response.headers.pop("Content-Length", None)
+        else:
+            body = response.get_data()
+            if len(body) < app.config["COMPRESS_MIN_SIZE"]:
+                return response
+            if encoding == "br":
+                response.set_data(brotli.compress(body, quality=min(level, 11)))
+            else:
+                response.set_data(gzip.compress(body, compresslevel=level))
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,51 @@
+# app/job_routes.py
+
+from flask import Blueprint, request, jsonify
+from app import db
+from app.models import Job
+from app.jobs import job_to_dict
+from app.utils import token_required, role_required
+
+job_bp = Blueprint("jobs", __name__, url_prefix="/jobs")
+
+
+@job_bp.route("", methods=["GET"])
+@role_required("admin")
+def list_jobs():
+    query = Job.query
+    if request.args.get("status"):
+        query = query.filter_by(status=request.args["status"])
+    if request.args.get("name"):
+        query = query.filter_by(name=request.args["name"])
+    try:
+        limit = max(1, min(int(request.args.get("limit") or 100), 1000))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    jobs = query.order_by(Job.id.desc()).limit(limit).all()
+    return jsonify({"jobs": [job_to_dict(j) for j in jobs]})
+
+
+@job_bp.route("/<int:job_id>", methods=["GET"])
+@token_required
+def get_job(job_id):
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if request.user.role != "admin" and job.created_by != request.user.id:
+        return jsonify({"error": "Permission denied"}), 403
+    return jsonify(job_to_dict(job))
+
+
+@job_bp.route("/<int:job_id>/retry", methods=["POST"])
+@role_required("admin")
+def retry_job(job_id):
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if job.status != "failed":
+        return jsonify({"error": "Only failed jobs can be retried"}), 400
+    job.status = "queued"
+    job.attempts = 0
+    job.finished_at = None
+    db.session.commit()
+    return jsonify(job_to_dict(job)), 202
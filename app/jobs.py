@@ -0,0 +1,251 @@
+# app/jobs.py
+
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import Job
+
+# name -> callable(payload) returning a JSON-serialisable result (or None)
+HANDLERS = {}
+
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 3600
+# A running job whose lease has expired belongs to a worker that died
+LEASE_SECONDS = 60
+
+
+def job_handler(name):
+    """
+    Register a function as the handler for jobs called `name`.
+    The handler runs inside an app context and receives the job payload.
+    """
+    def decorator(f):
+        HANDLERS[name] = f
+        return f
+    return decorator
+
+
+def enqueue(name, payload=None, idempotency_key=None, created_by=None, max_attempts=5, commit=True):
+    if name not in HANDLERS:
+        raise ValueError(f"Unknown job: {name}")
+    if idempotency_key:
+        existing = Job.query.filter_by(idempotency_key=idempotency_key).first()
+        if existing:
+            return existing
+    job = Job(
+        name=name,
+        payload=payload or {},
+        idempotency_key=idempotency_key,
+        created_by=created_by,
+        max_attempts=max_attempts,
+    )
+    db.session.add(job)
+    if commit:
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Lost a race with another request using the same key
+            db.session.rollback()
+            return Job.query.filter_by(idempotency_key=idempotency_key).first()
+    return job
+
+
+def job_to_dict(j):
+    return {
+        "id": j.id,
+        "name": j.name,
+        "status": j.status,
+        "attempts": j.attempts,
+        "max_attempts": j.max_attempts,
+        "run_at": j.run_at.isoformat() if j.run_at else None,
+        "last_error": j.last_error,
+        "result": j.result,
+        "created_at": j.created_at.isoformat() if j.created_at else None,
+        "finished_at": j.finished_at.isoformat() if j.finished_at else None,
+    }
+
+
+def backoff_delay(attempts):
+    return min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+
+
+def claim_next_job():
+    """
+    Atomically move the oldest due job from queued to running.
+    The conditional UPDATE means two workers can never claim the same row.
+    """
+    now = datetime.utcnow()
+    candidates = (
+        Job.query.with_entities(Job.id)
+        .filter(Job.status == "queued", Job.run_at <= now)
+        .order_by(Job.run_at, Job.id)
+        .limit(10)
+        .all()
+    )
+    for (job_id,) in candidates:
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "queued")
+            .values(
+                status="running",
+                attempts=Job.attempts + 1,
+                run_at=now,
+                lease_expires_at=now + timedelta(seconds=LEASE_SECONDS),
+            )
+        )
+        db.session.commit()
+        if claimed.rowcount == 1:
+            return db.session.get(Job, job_id)
+    return None
+
+
+def heartbeat(app, job_id, stop_event):
+    # Keep extending the lease while the handler runs so no other worker reclaims the job
+    while not stop_event.wait(LEASE_SECONDS / 3):
+        with app.app_context():
+            try:
+                db.session.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.status == "running")
+                    .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=LEASE_SECONDS))
+                )
+                db.session.commit()
+            except Exception:
+                app.logger.exception("Failed to extend lease for job %s", job_id)
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+
+def run_job(job):
+    handler = HANDLERS.get(job.name)
+    stop_heartbeat = threading.Event()
+    threading.Thread(
+        target=heartbeat,
+        args=(current_app._get_current_object(), job.id, stop_heartbeat),
+        name=f"job-heartbeat-{job.id}",
+        daemon=True,
+    ).start()
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job '{job.name}'")
+        result = handler(job.payload or {})
+    except Exception:
+        stop_heartbeat.set()
+        db.session.rollback()
+        job = db.session.get(Job, job.id)
+        job.last_error = traceback.format_exc(limit=5)
+        job.lease_expires_at = None
+        if job.attempts < job.max_attempts and handler is not None:
+            job.status = "queued"
+            job.run_at = datetime.utcnow() + timedelta(seconds=backoff_delay(job.attempts))
+        else:
+            job.status = "failed"
+            job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return False
+    stop_heartbeat.set()
+    job.status = "done"
+    job.result = result
+    job.lease_expires_at = None
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+    return True
+
+
+def recover_expired_jobs():
+    """
+    Handle jobs whose worker died mid-job (their lease was not renewed).
+    They are retried like a failed attempt, or marked failed once out of attempts.
+    """
+    now = datetime.utcnow()
+    expired = (Job.status == "running", Job.lease_expires_at < now)
+    failed = db.session.execute(
+        update(Job)
+        .where(*expired, Job.attempts >= Job.max_attempts)
+        .values(status="failed", finished_at=now, lease_expires_at=None, last_error="Worker lease expired")
+    )
+    requeued = db.session.execute(
+        update(Job)
+        .where(*expired, Job.attempts < Job.max_attempts)
+        .values(status="queued", run_at=now, lease_expires_at=None, last_error="Worker lease expired")
+    )
+    db.session.commit()
+    return requeued.rowcount, failed.rowcount
+
+
+def worker_loop(app, stop_event, poll_interval):
+    while not stop_event.is_set():
+        with app.app_context():
+            try:
+                job = claim_next_job()
+                if job is not None:
+                    run_job(job)
+            except Exception:
+                app.logger.exception("Job worker error")
+                db.session.rollback()
+                job = None
+            finally:
+                db.session.remove()
+        if job is None:
+            stop_event.wait(poll_interval)
+
+
+def recovery_loop(app, stop_event):
+    # One timer per worker process, independent of how busy the queue is
+    while not stop_event.wait(LEASE_SECONDS / 3):
+        with app.app_context():
+            try:
+                recover_expired_jobs()
+            except Exception:
+                app.logger.exception("Failed to recover expired jobs")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+
+def start_workers(app, concurrency=2, poll_interval=1.0):
+    stop_event = threading.Event()
+    threads = []
+    recovery = threading.Thread(target=recovery_loop, args=(app, stop_event), name="job-recovery", daemon=True)
+    recovery.start()
+    for i in range(concurrency):
+        t = threading.Thread(
+            target=worker_loop,
+            args=(app, stop_event, poll_interval),
+            name=f"job-worker-{i}",
+            daemon=True,
+        )
+        t.start()
+        threads.append(t)
+    return stop_event, threads
+
+
+@click.command("worker")
+@click.option("--concurrency", "-c", default=2, show_default=True, help="Number of worker threads.")
+@click.option("--poll-interval", default=1.0, show_default=True, help="Seconds to sleep when the queue is empty.")
+@with_appcontext
+def worker_command(concurrency, poll_interval):
+    """Run background jobs from the job queue."""
+    app = current_app._get_current_object()
+    requeued, failed = recover_expired_jobs()
+    if requeued or failed:
+        click.echo(f"Recovered jobs with expired leases: {requeued} requeued, {failed} failed")
+    click.echo(f"Starting {concurrency} worker(s) for: {', '.join(sorted(HANDLERS)) or 'no jobs'}")
+    stop_event, threads = start_workers(app, concurrency, poll_interval)
+    try:
+        while any(t.is_alive() for t in threads):
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        click.echo("Stopping workers...")
+        stop_event.set()
+        for t in threads:
+            t.join()
@@ -0,0 +1,41 @@
+# app/json_provider.py
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; Flask's stdlib provider is used without it
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+    Output is compact and falls back to Flask's default() for types orjson
+    does not know natively, such as Decimal.
+    """
+
+    def _dumps_bytes(self, obj):
+        # Datetimes go through default() so they match Flask's provider (HTTP dates)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        return self._dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj), mimetype=self.mimetype)
+
+
+def init_json_provider(app, name):
+    if name == "orjson":
+        if orjson is None:
+            app.logger.warning("JSON_PROVIDER=orjson but orjson is not installed; using the default provider")
+            return
+        app.json = OrjsonProvider(app)
@@ -1,18 +1,32 @@
 # app/property_routes.py
 
+import hashlib
 import os
 import uuid
 from flask import Blueprint, request, jsonify, current_app
+from sqlalchemy.exc import IntegrityError
 from werkzeug.utils import secure_filename
 from app import db
-from app.models import Property
-from app.utils import token_required, role_required
+from app.models import Property, Job
+from app.audit import audit_log
+from app.jobs import enqueue, job_handler, job_to_dict
+from app.serializers import property_serializer
+from app.utils import token_required, role_required, list_response
 
 property_bp = Blueprint("properties", __name__, url_prefix="/properties")
 
 ALLOWED_IMAGE_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
 ALLOWED_DOC_EXTENSIONS = {"pdf", "png", "jpg", "jpeg"}
 
+# Leading bytes each allowed extension must start with
+FILE_SIGNATURES = {
+    "pdf": (b"%PDF-",),
+    "png": (b"\x89PNG\r\n\x1a\n",),
+    "jpg": (b"\xff\xd8\xff",),
+    "jpeg": (b"\xff\xd8\xff",),
+    "gif": (b"GIF87a", b"GIF89a"),
+}
+
 
 def allowed_file(filename, doc=False):
     if "." not in filename:
@@ -26,48 +40,71 @@ def unique_filename(filename):
     return f"{uuid.uuid4().hex}.{ext}"
 
 
+def upload_path(folder_key, filename):
+    folder = current_app.config[folder_key]
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, filename)
+
+
+def commit_upload(key, saved_path):
+    """
+    Commit an upload and its job.
+    If a concurrent request with the same Idempotency-Key committed first,
+    discard this upload's file and return the winning job instead.
+    """
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        if key is None:
+            raise
+        os.remove(saved_path)
+        return Job.query.filter_by(idempotency_key=key).first()
+    return None
+
+
+def matches_signature(path):
+    ext = path.rsplit(".", 1)[1].lower()
+    with open(path, "rb") as fh:
+        head = fh.read(16)
+    return head.startswith(FILE_SIGNATURES.get(ext, ()))
+
+
+def upload_idempotency_key(kind, property_id):
+    # Hash the client's key so any header length fits Job.idempotency_key (String(120))
+    key = request.headers.get("Idempotency-Key")
+    if not key:
+        return None
+    return f"{kind}:{property_id}:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+
 def property_to_dict(p):
-    return {
-        "id": p.id,
-        "title": p.title,
-        "description": p.description,
-        "price": p.price,
-        "seller_id": p.seller_id,
-        "image_url": p.image_url,
-        "verified": p.verified,
-        "docs_url": p.docs_url,
-        "location": p.location,
-        "propertyType": p.property_type,
-        "bedrooms": p.bedrooms,
-        "bathrooms": p.bathrooms,
-        "area": p.area,
-        "created_at": p.created_at.isoformat() if p.created_at else None,
-    }
+    return property_serializer.obj_to_dict(p)
 
 
 @property_bp.route("", methods=["GET"])
 @token_required
 def list_properties():
     if request.user.role == "admin":
-        properties = Property.query.all()
+        properties = property_serializer.all()
     elif request.user.role == "seller":
-        properties = Property.query.filter_by(seller_id=request.user.id).all()
+        properties = property_serializer.all(Property.seller_id == request.user.id)
     else:
-        properties = Property.query.filter_by(verified=True).all()
-    return jsonify({"properties": [property_to_dict(p) for p in properties]})
+        properties = property_serializer.all(Property.verified.is_(True))
+    return list_response("properties", properties, property_serializer.keys)
 
 
 @property_bp.route("/<int:property_id>", methods=["GET"])
 @token_required
 def get_property(property_id):
-    prop = Property.query.get(property_id)
+    prop = property_serializer.first(Property.id == property_id)
     if not prop:
         return jsonify({"error": "Property not found"}), 404
-    if request.user.role == "buyer" and not prop.verified:
+    if request.user.role == "buyer" and not prop["verified"]:
         return jsonify({"error": "Not available"}), 403
-    if request.user.role == "seller" and prop.seller_id != request.user.id and not prop.verified:
+    if request.user.role == "seller" and prop["seller_id"] != request.user.id and not prop["verified"]:
         return jsonify({"error": "Not available"}), 403
-    return jsonify(property_to_dict(prop))
+    return jsonify(prop)
 
 
 @property_bp.route("", methods=["POST"])
@@ -90,6 +127,7 @@ def create_property():
     )
     db.session.add(new_property)
     db.session.commit()
+    audit_log.record("property.create", "property", new_property.id, {"title": new_property.title})
     return jsonify(property_to_dict(new_property)), 201
 
 @property_bp.route("/<int:property_id>", methods=["PUT"])
@@ -99,6 +137,7 @@ def update_property(property_id):
     if not prop:
         return jsonify({"error": "Property not found"}), 404
     data = request.get_json() or {}
+    before = property_to_dict(prop)
 
     prop.title = data.get("title", prop.title)
     prop.description = data.get("description", prop.description)
@@ -115,7 +154,11 @@ def update_property(property_id):
         prop.verified = bool(data["verified"])
 
     db.session.commit()
-    return jsonify(property_to_dict(prop))
+    after = property_to_dict(prop)
+    changes = {k: [v, after[k]] for k, v in before.items() if after[k] != v}
+    action = "property.verify" if "verified" in changes else "property.update"
+    audit_log.record(action, "property", prop.id, {"changes": changes})
+    return jsonify(after)
 
 
 
@@ -125,8 +168,10 @@ def delete_property(property_id):
     prop = Property.query.get(property_id)
     if not prop:
         return jsonify({"error": "Property not found"}), 404
+    title = prop.title
     db.session.delete(prop)
     db.session.commit()
+    audit_log.record("property.delete", "property", property_id, {"title": title})
     return jsonify({"message": f"Property {property_id} deleted"})
 
 
@@ -143,11 +188,26 @@ def upload_image(property_id):
         return jsonify({"error": "No selected file"}), 400
     if not allowed_file(file.filename, doc=False):
         return jsonify({"error": "File type not allowed"}), 400
+    key = upload_idempotency_key("process_image", property_id)
+    existing = Job.query.filter_by(idempotency_key=key).first() if key else None
+    if existing:
+        return jsonify({"image_url": prop.image_url, "job": job_to_dict(existing)}), 202
     filename = secure_filename(unique_filename(file.filename))
-    file.save(os.path.join(current_app.config["UPLOAD_FOLDER_IMAGES"], filename))
+    saved_path = upload_path("UPLOAD_FOLDER_IMAGES", filename)
+    file.save(saved_path)
     prop.image_url = f"/uploads/images/{filename}"
-    db.session.commit()
-    return jsonify({"image_url": prop.image_url}), 201
+    job = enqueue(
+        "process_image",
+        {"property_id": prop.id, "filename": filename},
+        idempotency_key=key,
+        created_by=request.user.id,
+        commit=False,
+    )
+    winner = commit_upload(key, saved_path)
+    if winner is not None:
+        return jsonify({"image_url": prop.image_url, "job": job_to_dict(winner)}), 202
+    audit_log.record("property.upload_image", "property", prop.id, {"image_url": prop.image_url, "job_id": job.id})
+    return jsonify({"image_url": prop.image_url, "job": job_to_dict(job)}), 202
 
 
 @property_bp.route("/<int:property_id>/upload_docs", methods=["POST"])
@@ -163,9 +223,56 @@ def upload_docs(property_id):
         return jsonify({"error": "No selected file"}), 400
     if not allowed_file(file.filename, doc=True):
         return jsonify({"error": "File type not allowed"}), 400
+    key = upload_idempotency_key("check_document", property_id)
+    existing = Job.query.filter_by(idempotency_key=key).first() if key else None
+    if existing:
+        return jsonify({"docs_url": prop.docs_url, "verified": prop.verified, "job": job_to_dict(existing)}), 202
     filename = secure_filename(unique_filename(file.filename))
-    file.save(os.path.join(current_app.config["UPLOAD_FOLDER_DOCS"], filename))
+    saved_path = upload_path("UPLOAD_FOLDER_DOCS", filename)
+    file.save(saved_path)
     prop.docs_url = f"/uploads/docs/{filename}"
+    was_verified = prop.verified
     prop.verified = False
-    db.session.commit()
-    return jsonify({"docs_url": prop.docs_url, "verified": prop.verified}), 201
+    job = enqueue(
+        "check_document",
+        {"property_id": prop.id, "filename": filename},
+        idempotency_key=key,
+        created_by=request.user.id,
+        commit=False,
+    )
+    winner = commit_upload(key, saved_path)
+    if winner is not None:
+        return jsonify({"docs_url": prop.docs_url, "verified": prop.verified, "job": job_to_dict(winner)}), 202
+    audit_log.record("property.upload_docs", "property", prop.id, {
+        "docs_url": prop.docs_url,
+        "job_id": job.id,
+        # New documents always reset verification; keep the flip visible like property.verify does
+        "changes": {"verified": [was_verified, False]} if was_verified else {},
+    })
+    return jsonify({"docs_url": prop.docs_url, "verified": prop.verified, "job": job_to_dict(job)}), 202
+
+
+# ---------------- BACKGROUND JOBS ----------------
+def _check_upload(payload, folder_key, url_prefix, url_attr):
+    path = os.path.join(current_app.config[folder_key], payload["filename"])
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    if matches_signature(path):
+        return {"valid": True, "size": os.path.getsize(path)}
+    # Content does not match the extension: drop the file and unlink it from the property
+    os.remove(path)
+    prop = db.session.get(Property, payload["property_id"])
+    if prop and getattr(prop, url_attr) == f"{url_prefix}/{payload['filename']}":
+        setattr(prop, url_attr, None)
+        db.session.commit()
+    return {"valid": False, "error": "File content does not match its extension"}
+
+
+@job_handler("process_image")
+def process_image(payload):
+    return _check_upload(payload, "UPLOAD_FOLDER_IMAGES", "/uploads/images", "image_url")
+
+
+@job_handler("check_document")
+def check_document(payload):
+    return _check_upload(payload, "UPLOAD_FOLDER_DOCS", "/uploads/docs", "docs_url")
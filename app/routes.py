@@ -2,15 +2,16 @@
 from flask import Blueprint, request, jsonify
 from app.models import User
 from app import db
-from app.utils import role_required, token_required, generate_token
+from app.audit import audit_log
+from app.serializers import user_serializer
+from app.utils import role_required, token_required, generate_token, list_response
 
 bp = Blueprint("api", __name__)
 
 @bp.route("/users")
 @role_required("admin")
 def list_users():
-    users = User.query.all()
-    return {"users": [{"id": u.id, "username": u.username, "email": u.email, "role": u.role} for u in users]}
+    return list_response("users", user_serializer.all(), user_serializer.keys)
 
 @bp.route("/users", methods=["POST"])
 def create_user():
@@ -24,14 +25,14 @@ def create_user():
     new_user.set_password(data["password"])
     db.session.add(new_user)
     db.session.commit()
-    return {"id": new_user.id, "username": new_user.username, "email": new_user.email, "role": new_user.role}, 201
+    return user_serializer.obj_to_dict(new_user), 201
 
 @bp.route("/users/<int:user_id>", methods=["GET"])
 @role_required("admin")
 def get_user(user_id):
-    user = User.query.get(user_id)
+    user = user_serializer.first(User.id == user_id)
     if not user: return {"error": "User not found"}, 404
-    return {"id": user.id, "username": user.username, "email": user.email, "role": user.role}
+    return user
 
 @bp.route("/users/<int:user_id>", methods=["PUT"])
 @token_required
@@ -42,10 +43,13 @@ def update_user(user_id):
     if request.user.role != "admin" and request.user.id != user.id:
         return {"error": "Permission denied"}, 403
     data = request.get_json() or {}
+    before = {"username": user.username, "email": user.email, "role": user.role}
     if "username" in data: user.username = data["username"]
     if "email" in data: user.email = data["email"]
     if request.user.role == "admin" and "role" in data: user.role = data["role"]
     db.session.commit()
+    changes = {k: [v, getattr(user, k)] for k, v in before.items() if getattr(user, k) != v}
+    audit_log.record("user.update", "user", user.id, {"changes": changes})
     return {"message": "User updated"}
 
 @bp.route("/users/<int:user_id>/password", methods=["PUT"])
@@ -59,6 +63,7 @@ def change_password(user_id):
     if "new_password" not in data: return {"error": "New password required"}, 400
     user.set_password(data["new_password"])
     db.session.commit()
+    audit_log.record("user.change_password", "user", user.id)
     return {"message": "Password updated successfully"}
 
 @bp.route("/users/<int:user_id>/avatar", methods=["POST"])
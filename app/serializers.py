@@ -0,0 +1,78 @@
+# app/serializers.py
+
+from sqlalchemy import DateTime, select
+from app import db
+from app.models import User, Property
+
+# (output key, column) pairs; the order is the output order
+PROPERTY_FIELDS = (
+    ("id", Property.id),
+    ("title", Property.title),
+    ("description", Property.description),
+    ("price", Property.price),
+    ("seller_id", Property.seller_id),
+    ("image_url", Property.image_url),
+    ("verified", Property.verified),
+    ("docs_url", Property.docs_url),
+    ("location", Property.location),
+    ("propertyType", Property.property_type),
+    ("bedrooms", Property.bedrooms),
+    ("bathrooms", Property.bathrooms),
+    ("area", Property.area),
+    ("created_at", Property.created_at),
+)
+
+USER_FIELDS = (
+    ("id", User.id),
+    ("username", User.username),
+    ("email", User.email),
+    ("role", User.role),
+)
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+class RowSerializer:
+    """
+    Builds response dicts straight from result tuples of select(*columns),
+    so list endpoints never hydrate ORM instances.
+    """
+
+    def __init__(self, fields):
+        self.keys = tuple(k for k, _ in fields)
+        self.columns = tuple(c for _, c in fields)
+        self._attrs = tuple(c.key for c in self.columns)
+        # Only datetime columns need converting; everything else is JSON-native
+        self._converters = tuple(
+            (i, _isoformat) for i, c in enumerate(self.columns) if isinstance(c.type, DateTime)
+        )
+
+    def select(self):
+        return select(*self.columns)
+
+    def row_to_dict(self, row):
+        d = dict(zip(self.keys, row))
+        for i, convert in self._converters:
+            key = self.keys[i]
+            d[key] = convert(d[key])
+        return d
+
+    def obj_to_dict(self, obj):
+        return self.row_to_dict([getattr(obj, a) for a in self._attrs])
+
+    def all(self, *criteria, order_by=None):
+        stmt = self.select().where(*criteria)
+        if order_by is not None:
+            stmt = stmt.order_by(order_by)
+        row_to_dict = self.row_to_dict
+        return [row_to_dict(r) for r in db.session.execute(stmt)]
+
+    def first(self, *criteria):
+        row = db.session.execute(self.select().where(*criteria).limit(1)).first()
+        return self.row_to_dict(row) if row is not None else None
+
+
+property_serializer = RowSerializer(PROPERTY_FIELDS)
+user_serializer = RowSerializer(USER_FIELDS)
@@ -0,0 +1,75 @@
+# app/startup.py
+
+import os
+import subprocess
+import sys
+import time
+
+import click
+
+
+class StartupTimer:
+    """
+    Records how long each step of create_app takes.
+    Call mark(name) at the end of a step; the step is timed from the previous mark.
+    """
+
+    def __init__(self):
+        self.steps = []
+        self._last = time.perf_counter()
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.steps.append((name, now - self._last))
+        self._last = now
+
+    @property
+    def total(self):
+        return sum(d for _, d in self.steps)
+
+
+def parse_importtime(stderr, top=10):
+    # Lines look like "import time:   self [us] | cumulative | package"
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nesting is two spaces per level; keep our own imports and their direct dependencies
+        if len(name) - len(name.lstrip(" ")) > 3:
+            continue
+        modules.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(modules, key=lambda x: x[1], reverse=True)[:top]
+
+
+def report(import_time, serving):
+    from app import create_app
+    app = create_app(serving=serving)
+    timer = app.extensions["startup_timer"]
+    click.echo(f"import app: {import_time * 1000:8.1f} ms")
+    for name, duration in timer.steps:
+        click.echo(f"  {name:<18} {duration * 1000:8.1f} ms")
+    click.echo(f"create_app: {timer.total * 1000:8.1f} ms")
+
+
+@click.command("startup-profile")
+@click.option("--serving", is_flag=True, help="Profile the serving configuration (deferred Flask-Migrate).")
+@click.option("--top", default=10, show_default=True, help="Number of slowest imports to show.")
+def startup_profile_command(serving, top):
+    """Report import time and per-step create_app time in a fresh interpreter."""
+    # Time the package import before anything else in the child imports it
+    code = (
+        "import time; t = time.perf_counter(); import app; t = time.perf_counter() - t; "
+        f"from app.startup import report; report(t, {bool(serving)})"
+    )
+    cmd = [sys.executable, "-X", "importtime", "-c", code]
+    env = dict(os.environ)
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [project_root, env.get("PYTHONPATH")]))
+    result = subprocess.run(cmd, capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise click.ClickException(result.stderr.strip().splitlines()[-1])
+    click.echo(result.stdout, nl=False)
+    click.echo("slowest imports:")
+    for name, seconds in parse_importtime(result.stderr, top):
+        click.echo(f"  {name:<32} {seconds * 1000:8.1f} ms")
@@ -87,3 +87,14 @@ def token_required(f):
             return jsonify({"error": f"Token is invalid: {str(e)}"}), 401
         return f(*args, **kwargs)
     return decorated
+
+
+def list_response(key, rows, columns):
+    """
+    Build a list payload under `key`.
+    With ?format=columns the rows are sent as the `columns` key list plus a
+    value array per row, which avoids repeating every key in large lists.
+    """
+    if request.args.get("format") == "columns":
+        return jsonify({key: {"columns": list(columns), "rows": [[r[c] for c in columns] for r in rows]}})
+    return jsonify({key: rows})
@@ -0,0 +1,6 @@
+# Production ASGI entry point, e.g. `uvicorn asgi:app`
+# Bodies are buffered on the event loop, views run in a pool of ASGI_THREADS threads.
+from app import create_app
+from app.asgi import AsgiAdapter
+
+app = AsgiAdapter(create_app(serving=True))
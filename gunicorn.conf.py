@@ -0,0 +1,33 @@
+# gunicorn.conf.py
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+
+# Import and build the app once in the master; workers are forked from it
+# and share those pages copy-on-write instead of each paying the startup cost.
+preload_app = True
+
+
+def pre_fork(server, worker):
+    # Objects created so far are never collected, so GC passes in the workers
+    # don't write to (and therefore copy) the shared pages.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Pooled connections opened in the master must not be shared across processes.
+    # Use the app the master preloaded (wsgi:app or asgi:app) rather than importing
+    # an entry point here, which would build a second app in every worker.
+    from flask import Flask
+    from app import db
+
+    loaded = worker.app.wsgi()
+    flask_app = loaded if isinstance(loaded, Flask) else getattr(loaded, "wsgi_app", None)
+    if not isinstance(flask_app, Flask):
+        return
+    with flask_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -0,0 +1,140 @@
+"""
+Slow-client load test: threaded WSGI (gunicorn gthread) vs the ASGI entry point.
+
+SLOW slow clients each trickle a multipart image upload to
+POST /properties/<id>/upload_image. While they do, one client sends
+back-to-back GET /properties/<id> and the script reports how many
+succeeded and their latency.
+
+Run from the repo root:
+
+    export DATABASE_URL=sqlite:////tmp/loadtest.db
+    python scripts/loadtest_slow_clients.py --seed > /tmp/loadtest.token
+
+    BIND=127.0.0.1:8001 WEB_CONCURRENCY=1 gunicorn -c gunicorn.conf.py -k gthread --threads 8 wsgi:app &
+    ASGI_THREADS=8 uvicorn asgi:app --port 8002 --log-level warning &
+
+    python scripts/loadtest_slow_clients.py --port 8001 --slow 40 --token "$(cat /tmp/loadtest.token)"
+    python scripts/loadtest_slow_clients.py --port 8002 --slow 40 --token "$(cat /tmp/loadtest.token)"
+"""
+import argparse
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+import http.client
+
+BOUNDARY = "loadtest-boundary"
+
+
+def seed():
+    # Create a seller with one property and print a token for it
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app import create_app, db
+    from app.models import User, Property
+    from app.utils import generate_token
+
+    app = create_app(serving=True)
+    with app.app_context():
+        db.create_all()
+        user = User.query.filter_by(username="loadtest").first()
+        if not user:
+            user = User(username="loadtest", email="loadtest@example.com", role="seller")
+            user.set_password("loadtest")
+            db.session.add(user)
+            db.session.commit()
+        if not Property.query.filter_by(seller_id=user.id).first():
+            db.session.add(Property(title="Load test", price=1, seller_id=user.id))
+            db.session.commit()
+        print(generate_token(user))
+
+
+def multipart_body(size):
+    payload = b"\x89PNG\r\n\x1a\n" + b"x" * size
+    head = (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="a.png"\r\n'
+        "Content-Type: image/png\r\n\r\n"
+    ).encode()
+    return head + payload + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def slow_upload(args, body, results, lock):
+    try:
+        s = socket.create_connection((args.host, args.port), timeout=120)
+        s.sendall((
+            f"POST /properties/{args.property_id}/upload_image HTTP/1.1\r\n"
+            f"Host: {args.host}\r\n"
+            f"Authorization: Bearer {args.token}\r\n"
+            f"Content-Type: multipart/form-data; boundary={BOUNDARY}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode())
+        step = max(1, len(body) // args.chunks)
+        delay = args.upload_seconds / args.chunks
+        for i in range(0, len(body), step):
+            s.sendall(body[i:i + step])
+            time.sleep(delay)
+        status = s.recv(64).split(b" ", 2)[1]
+        s.close()
+        ok = status == b"202"
+    except OSError:
+        ok = False
+    with lock:
+        results["ok" if ok else "failed"] += 1
+
+
+def fast_requests(args, deadline):
+    latencies = []
+    while time.time() < deadline:
+        started = time.perf_counter()
+        conn = http.client.HTTPConnection(args.host, args.port, timeout=60)
+        conn.request("GET", f"/properties/{args.property_id}", headers={"Authorization": f"Bearer {args.token}"})
+        conn.getresponse().read()
+        conn.close()
+        latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="Create test data in DATABASE_URL and print a token.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--token", help="Bearer token of the property's seller (see --seed).")
+    parser.add_argument("--property-id", type=int, default=1)
+    parser.add_argument("--slow", type=int, default=40, help="Number of concurrent slow uploaders.")
+    parser.add_argument("--upload-kb", type=int, default=256, help="Size of each upload.")
+    parser.add_argument("--upload-seconds", type=float, default=4.0, help="Time each upload is spread over.")
+    parser.add_argument("--chunks", type=int, default=40)
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds of fast requests to measure.")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed()
+        return
+    if not args.token:
+        parser.error("--token is required (create one with --seed)")
+
+    body = multipart_body(args.upload_kb * 1024)
+    results = {"ok": 0, "failed": 0}
+    lock = threading.Lock()
+    uploaders = [threading.Thread(target=slow_upload, args=(args, body, results, lock)) for _ in range(args.slow)]
+    for t in uploaders:
+        t.start()
+    time.sleep(0.5)  # let the uploads get going
+    latencies = fast_requests(args, time.time() + args.duration)
+    for t in uploaders:
+        t.join()
+
+    print(
+        f"slow uploaders={args.slow} ok={results['ok']} failed={results['failed']} | "
+        f"fast GETs: n={len(latencies)} p50={statistics.median(latencies) * 1000:.0f} ms "
+        f"max={latencies[-1] * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()